@@ -7,14 +7,24 @@ https://github.com/salmeister/ha-schoolcafe-menu
 from __future__ import annotations
 
 import logging
+from datetime import timedelta
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryError
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import async_track_time_change
 
 from .api import SchoolCafeAPI
-from .const import DOMAIN
+from .const import (
+    DOMAIN,
+    CONF_POLL_INTERVAL,
+    DEFAULT_POLL_INTERVAL,
+    MIN_POLL_INTERVAL,
+    MAX_POLL_INTERVAL,
+)
+from .coordinator import SchoolCafeDataUpdateCoordinator, get_cache_store
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -26,12 +36,9 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     config = entry.data
 
     # Validate required configuration
-    required_fields = ["school_id"]
-    missing_fields = [field for field in required_fields if not config.get(field)]
-    
-    if missing_fields:
-        _LOGGER.error("Missing required configuration fields: %s", missing_fields)
-        raise ConfigEntryError(f"Missing configuration fields: {missing_fields}")
+    if not config.get("school_id"):
+        _LOGGER.error("Missing required configuration field: school_id")
+        raise ConfigEntryError("Missing configuration field: school_id")
 
     # Initialize the API object
     api = SchoolCafeAPI(
@@ -42,20 +49,37 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         person_id=config.get("person_id"),
         menu_lines=config.get("menu_lines", ["BLUE LINE", "GOLD LINE"]),
         days_to_fetch=config.get("days_to_fetch", 7),
+        session=async_get_clientsession(hass),
+    )
+
+    poll_interval: int = config.get(CONF_POLL_INTERVAL, DEFAULT_POLL_INTERVAL)
+    poll_interval = min(max(poll_interval, MIN_POLL_INTERVAL), MAX_POLL_INTERVAL)
+
+    # Create update coordinator
+    coordinator = SchoolCafeDataUpdateCoordinator(
+        hass=hass,
+        api=api,
+        update_interval=timedelta(minutes=poll_interval),
+        entry_id=entry.entry_id,
     )
 
-    # Test the connection
-    try:
-        await api.test_connection()
-        _LOGGER.info("Successfully connected to SchoolCafe API")
-    except Exception as e:
-        _LOGGER.error("Failed to connect to SchoolCafe API: %s", e)
-        await api.close()
-        raise ConfigEntryError(f"Cannot connect to SchoolCafe: {e}") from e
+    # Seed with menus saved by a previous run; they are reused as-is when saved
+    # today and kept as a fallback if the first fetch fails. The first refresh
+    # doubles as the connection test and raises ConfigEntryNotReady if it fails
+    # with nothing saved
+    await coordinator.async_load_cache()
+    await coordinator.async_config_entry_first_refresh()
 
-    # Store the API instance in hass.data
+    # Refresh just after midnight so sensors pick up the newly revealed day
+    entry.async_on_unload(
+        async_track_time_change(
+            hass, coordinator.async_midnight_refresh, hour=0, minute=0, second=30
+        )
+    )
+
+    # Store the coordinator (and through it the API instance) in hass.data
     hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN][entry.entry_id] = api
+    hass.data[DOMAIN][entry.entry_id] = coordinator
 
     # Set up platforms
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
@@ -70,9 +94,11 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     
     if unload_ok:
         # Clean up API connection
-        api = hass.data[DOMAIN].get(entry.entry_id)
-        if api:
-            await api.close()
+        coordinator = hass.data[DOMAIN].get(entry.entry_id)
+        if coordinator:
+            # Flush the delayed save so it cannot fire after the entry is removed
+            await coordinator.async_save_cache()
+            await coordinator.api.close()
         
         # Remove data
         hass.data[DOMAIN].pop(entry.entry_id, None)
@@ -82,3 +108,8 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             hass.data.pop(DOMAIN, None)
     
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the saved menu data when a config entry is deleted."""
+    await get_cache_store(hass, entry.entry_id).async_remove()
@@ -3,22 +3,73 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
-from urllib.parse import quote
+import random
+import re
+import time
+from datetime import date, datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache, partial
+from typing import Any, Dict, List, Optional, Tuple
 
 import aiohttp
+import orjson
 from aiohttp import ClientTimeout, ClientError
+from yarl import URL
 
 from .const import (
     SCHOOLCAFE_API_BASE,
+    CACHE_TTL,
+    ERROR_BODY_MAX_BYTES,
+    JSON_OFFLOAD_THRESHOLD,
     DEFAULT_TIMEOUT,
     MAX_RETRIES,
-    RETRY_DELAY,
+    RETRY_BASE_DELAY,
+    RETRY_MAX_DELAY,
+    RETRY_JITTER,
+    RETRYABLE_STATUS_CODES,
+    MAX_CONCURRENT_REQUESTS,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
+_ALLERGEN_SPLIT = re.compile(r"\s*,\s*")
+
+
+@lru_cache(maxsize=64)
+def _format_serving_date(serving_date: date) -> str:
+    """Format date for SchoolCafe API (MM/DD/YYYY)."""
+    return f"{serving_date.month:02d}/{serving_date.day:02d}/{serving_date.year:04d}"
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given as seconds or an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def _is_retryable_status(status: int) -> bool:
+    """Return True if a request that failed with this status may succeed later."""
+    return status >= 500 or status in RETRYABLE_STATUS_CODES
+
+
+def _retry_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    """Return the delay before the next attempt (exponential backoff with jitter)."""
+    if retry_after is not None:
+        return min(RETRY_MAX_DELAY, retry_after)
+    delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * (2 ** (attempt - 1)))
+    return delay * (1 + random.uniform(-RETRY_JITTER, RETRY_JITTER))
+
 
 class SchoolCafeAPIError(Exception):
     """Base exception for SchoolCafe API errors."""
@@ -45,6 +96,7 @@ class SchoolCafeAPI:
         menu_lines: Optional[List[str]] = None,
         days_to_fetch: int = 7,
         timeout: int = DEFAULT_TIMEOUT,
+        session: Optional[aiohttp.ClientSession] = None,
     ) -> None:
         """Initialize the SchoolCafe API client."""
         self.school_id = school_id
@@ -52,58 +104,86 @@ class SchoolCafeAPI:
         self.meal_type = meal_type
         self.serving_line = serving_line
         self.person_id = person_id or "null"
-        self.menu_lines = menu_lines or ["BLUE LINE", "GOLD LINE"]
+        self.menu_lines = tuple(menu_lines or ["BLUE LINE", "GOLD LINE"])
         self.days_to_fetch = days_to_fetch
         self.timeout = timeout
-        self._session: Optional[aiohttp.ClientSession] = None
+        self._timeout = ClientTimeout(total=timeout)
+        # A session passed in (e.g. Home Assistant's shared one) is never closed here
+        self._session: Optional[aiohttp.ClientSession] = session
+        self._owns_session = session is None
+        # Successful responses keyed by serving date: (monotonic fetch time, data)
+        self._cache: Dict[date, Tuple[float, Dict[str, Any]]] = {}
+        self._inflight: Dict[date, asyncio.Future] = {}
+        # Normalized per-line views keyed by date string: (raw menu, view)
+        self._day_views: Dict[str, Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]] = {}
+        # Everything except the serving date is fixed for the client's lifetime
+        self._base_url = URL(
+            f"{SCHOOLCAFE_API_BASE}/CalendarView/GetDailyMenuitemsByGrade"
+        ).with_query(
+            {
+                "SchoolId": self.school_id,
+                "ServingLine": self.serving_line,
+                "MealType": self.meal_type,
+                "Grade": self.grade,
+                "PersonId": self.person_id,
+            }
+        )
 
     async def _get_session(self) -> aiohttp.ClientSession:
         """Get or create an aiohttp session."""
         if self._session is None or self._session.closed:
-            timeout = ClientTimeout(total=self.timeout)
             self._session = aiohttp.ClientSession(
-                timeout=timeout,
-                connector=aiohttp.TCPConnector(ssl=True, limit=10),
+                timeout=self._timeout,
+                connector=aiohttp.TCPConnector(
+                    ssl=True,
+                    limit=10,
+                    limit_per_host=4,
+                    ttl_dns_cache=3600,
+                    keepalive_timeout=75,
+                ),
+                headers={"Accept-Encoding": "gzip", "Connection": "keep-alive"},
             )
+            self._owns_session = True
             _LOGGER.debug("Created new aiohttp session")
         return self._session
 
     async def close(self) -> None:
-        """Close the aiohttp session."""
-        if self._session and not self._session.closed:
+        """Close the aiohttp session if it was created by this client."""
+        if self._owns_session and self._session and not self._session.closed:
             await self._session.close()
             self._session = None
 
-    def _format_date(self, date: datetime) -> str:
+    def _format_date(self, serving_date: date) -> str:
         """Format date for SchoolCafe API (MM/DD/YYYY)."""
-        return date.strftime("%m/%d/%Y")
+        return _format_serving_date(serving_date)
 
-    def _build_api_url(self, serving_date: datetime) -> str:
+    def _build_api_url(self, serving_date: date) -> URL:
         """Build the API URL for a specific serving date."""
-        date_str = quote(self._format_date(serving_date))
-        serving_line_encoded = quote(self.serving_line)
-        meal_type_encoded = quote(self.meal_type)
-        
-        url = (
-            f"{SCHOOLCAFE_API_BASE}/CalendarView/GetDailyMenuitemsByGrade"
-            f"?SchoolId={self.school_id}"
-            f"&ServingDate={date_str}"
-            f"&ServingLine={serving_line_encoded}"
-            f"&MealType={meal_type_encoded}"
-            f"&Grade={self.grade}"
-            f"&PersonId={self.person_id}"
-        )
-        
-        return url
+        return self._base_url.update_query(ServingDate=self._format_date(serving_date))
 
     async def test_connection(self) -> bool:
         """Test the connection to SchoolCafe API."""
         try:
-            # Test with today's date
+            # Test with today's date; a HEAD request avoids downloading the menu
             today = datetime.now().date()
-            menu_data = await self.get_menu_for_date(today)
-            
-            # If we get data back (even if empty), connection is working
+            url = self._build_api_url(today)
+            session = await self._get_session()
+            try:
+                async with session.head(
+                    url, timeout=self._timeout, allow_redirects=True
+                ) as response:
+                    status = response.status
+            except (ClientError, asyncio.TimeoutError) as e:
+                _LOGGER.debug("HEAD request failed, retrying with GET: %s", e)
+                status = None
+
+            if status is None or status == 405 or _is_retryable_status(status):
+                # HEAD unsupported or failed transiently; a full request retries
+                await self.get_menu_for_date(today)
+            elif status not in (200, 404):
+                raise SchoolCafeConnectionError(f"HTTP error {status}")
+
+            # If we get a response (even if empty), connection is working
             _LOGGER.debug("Connection test successful")
             return True
             
@@ -111,7 +191,7 @@ class SchoolCafeAPI:
             _LOGGER.error("Connection test failed: %s", e)
             raise SchoolCafeConnectionError(f"Connection test failed: {e}") from e
 
-    async def get_menu_for_date(self, serving_date: datetime.date) -> Dict[str, Any]:
+    async def get_menu_for_date(self, serving_date: date) -> Dict[str, Any]:
         """
         Get menu data for a specific date.
         
@@ -124,49 +204,90 @@ class SchoolCafeAPI:
         Raises:
             SchoolCafeAPIError: If the request fails
         """
-        url = self._build_api_url(datetime.combine(serving_date, datetime.min.time()))
+        cached = self._cache.get(serving_date)
+        if cached and time.monotonic() - cached[0] < CACHE_TTL:
+            _LOGGER.debug("Using cached menu data for %s", serving_date)
+            return cached[1]
+
+        # Share a single request between concurrent callers for the same date
+        request = self._inflight.get(serving_date)
+        if request is None:
+            request = asyncio.ensure_future(self._request_menu_for_date(serving_date))
+            self._inflight[serving_date] = request
+            request.add_done_callback(partial(self._request_done, serving_date))
+
+        return await asyncio.shield(request)
+
+    def _request_done(self, serving_date: date, request: asyncio.Future) -> None:
+        """Forget a finished in-flight request."""
+        if self._inflight.get(serving_date) is request:
+            del self._inflight[serving_date]
+        if not request.cancelled():
+            # Mark the exception as retrieved in case every caller was cancelled
+            request.exception()
+
+    async def _request_menu_for_date(self, serving_date: date) -> Dict[str, Any]:
+        """Request menu data for a date from the API, retrying transient failures."""
+        url = self._build_api_url(serving_date)
         
         _LOGGER.debug("Requesting menu data from: %s", url)
         
         for attempt in range(1, MAX_RETRIES + 1):
             try:
                 session = await self._get_session()
-                async with session.get(url) as response:
+                async with session.get(url, timeout=self._timeout) as response:
                     _LOGGER.debug("Attempt %d: Response status: %s", attempt, response.status)
                     
                     if response.status == 404:
                         _LOGGER.warning("No menu data found for date: %s", serving_date)
                         return {}
                     elif response.status != 200:
-                        error_text = await response.text()
+                        # Only the start of the body is needed for the log message
+                        error_text = (
+                            await response.content.read(ERROR_BODY_MAX_BYTES)
+                        ).decode("utf-8", errors="replace")
                         _LOGGER.warning("HTTP error %d: %s", response.status, error_text)
-                        if attempt < MAX_RETRIES:
-                            await asyncio.sleep(RETRY_DELAY)
-                            continue
-                        raise SchoolCafeConnectionError(
-                            f"HTTP error {response.status}: {error_text}"
-                        )
-                    
-                    try:
-                        response_json = await response.json()
-                        _LOGGER.debug("Successfully retrieved menu data for %s", serving_date)
-                        return response_json
-                    except Exception as e:
-                        raise SchoolCafeDataError(f"Invalid JSON response: {e}") from e
-                        
+                        if not _is_retryable_status(response.status):
+                            raise SchoolCafeConnectionError(
+                                f"Unrecoverable HTTP error {response.status}: {error_text}"
+                            )
+                        if attempt >= MAX_RETRIES:
+                            raise SchoolCafeConnectionError(
+                                f"HTTP error {response.status}: {error_text}"
+                            )
+                        retry_after = None
+                        if response.status in (429, 503):
+                            retry_after = _parse_retry_after(
+                                response.headers.get("Retry-After")
+                            )
+                    else:
+                        try:
+                            body = await response.read()
+                            if len(body) > JSON_OFFLOAD_THRESHOLD:
+                                # Keep the event loop responsive while large menus decode
+                                response_json = await asyncio.to_thread(orjson.loads, body)
+                            else:
+                                response_json = orjson.loads(body)
+                            _LOGGER.debug("Successfully retrieved menu data for %s", serving_date)
+                            self._cache[serving_date] = (time.monotonic(), response_json)
+                            return response_json
+                        except orjson.JSONDecodeError as e:
+                            raise SchoolCafeDataError(f"Invalid JSON response: {e}") from e
+
             except ClientError as e:
-                if attempt < MAX_RETRIES:
-                    _LOGGER.warning(
-                        "Attempt %d failed with connection error: %s, retrying...", 
-                        attempt, e
-                    )
-                    await asyncio.sleep(RETRY_DELAY)
-                    continue
-                else:
+                if attempt >= MAX_RETRIES:
                     raise SchoolCafeConnectionError(
                         f"Connection failed after {MAX_RETRIES} attempts: {e}"
                     ) from e
-        
+                _LOGGER.warning(
+                    "Attempt %d failed with connection error: %s, retrying...",
+                    attempt, e
+                )
+                retry_after = None
+
+            # Sleep outside the response context so the pooled connection is released
+            await asyncio.sleep(_retry_delay(attempt, retry_after))
+
         raise SchoolCafeAPIError(f"Failed to retrieve data after {MAX_RETRIES} attempts")
 
     async def get_menu_data(self) -> Dict[str, Dict[str, Any]]:
@@ -175,25 +296,91 @@ class SchoolCafeAPI:
         
         Returns:
             Dictionary with date strings as keys and menu data as values
+            
+        Raises:
+            SchoolCafeConnectionError: If the request failed for every day
         """
-        results = {}
         today = datetime.now().date()
-        
-        for i in range(self.days_to_fetch):
-            target_date = today + timedelta(days=i)
-            date_key = target_date.strftime("%Y-%m-%d")
-            
-            try:
-                menu_data = await self.get_menu_for_date(target_date)
+        for cached_date in [d for d in self._cache if d < today]:
+            del self._cache[cached_date]
+        today_key = today.isoformat()
+        for date_key in [k for k in self._day_views if k < today_key]:
+            del self._day_views[date_key]
+
+        target_dates = [today + timedelta(days=i) for i in range(self.days_to_fetch)]
+
+        # Days are independent requests, so fetch them concurrently while
+        # keeping the number of simultaneous requests to the host bounded
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+        async def _fetch(target_date: date) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.get_menu_for_date(target_date)
+
+        menus = await asyncio.gather(
+            *(_fetch(target_date) for target_date in target_dates),
+            return_exceptions=True,
+        )
+
+        results = {}
+        for target_date, menu_data in zip(target_dates, menus):
+            date_key = target_date.isoformat()
+
+            if isinstance(menu_data, Exception):
+                _LOGGER.warning("Failed to get menu data for %s: %s", date_key, menu_data)
+                results[date_key] = {}
+            else:
                 results[date_key] = menu_data
                 _LOGGER.debug("Retrieved menu data for %s", date_key)
-            except Exception as e:
-                _LOGGER.warning("Failed to get menu data for %s: %s", date_key, e)
-                results[date_key] = {}
-        
+
+        errors = [menu_data for menu_data in menus if isinstance(menu_data, Exception)]
+        if errors and len(errors) == len(menus):
+            raise SchoolCafeConnectionError(
+                f"Failed to get menu data for any day: {errors[0]}"
+            ) from errors[0]
+
         return results
 
-    def extract_menu_items_for_line(self, menu_data: Dict[str, Any], line: str) -> List[Dict[str, Any]]:
+    def build_day_view(self, raw_menu: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """
+        Build a normalized view of one day's menu for every configured line.
+        
+        Args:
+            raw_menu: Raw menu data from API for a single day
+            
+        Returns:
+            Dictionary keyed by menu line with the formatted description and
+            the raw items
+        """
+        view = {}
+        for line in self.menu_lines:
+            items = self.extract_menu_items_for_line(raw_menu, line)
+            view[line] = {
+                "description": self.format_menu_description(items),
+                "items": items,
+            }
+        return view
+
+    def get_day_view(self, date_key: str, raw_menu: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the normalized view for a day, building it once per fetched menu.
+        
+        Args:
+            date_key: Date string (YYYY-MM-DD) the menu belongs to
+            raw_menu: Raw menu data from API for that day
+            
+        Returns:
+            The view produced by build_day_view for raw_menu
+        """
+        cached = self._day_views.get(date_key)
+        if cached and cached[0] is raw_menu:
+            return cached[1]
+        view = self.build_day_view(raw_menu)
+        self._day_views[date_key] = (raw_menu, view)
+        return view
+
+    @staticmethod
+    def extract_menu_items_for_line(menu_data: Dict[str, Any], line: str) -> List[Dict[str, Any]]:
         """
         Extract menu items for a specific menu line.
         
@@ -206,7 +393,8 @@ class SchoolCafeAPI:
         """
         return menu_data.get(line, [])
 
-    def format_menu_description(self, menu_items: List[Dict[str, Any]]) -> str:
+    @staticmethod
+    def format_menu_description(menu_items: List[Dict[str, Any]]) -> str:
         """
         Format menu items into a readable description.
         
@@ -218,15 +406,13 @@ class SchoolCafeAPI:
         """
         if not menu_items:
             return "No items available"
-            
-        descriptions = []
-        for item in menu_items:
-            desc = item.get("MenuItemDescription", "Unknown Item")
-            descriptions.append(desc)
-            
-        return ", ".join(descriptions)
 
-    def get_nutrition_info(self, menu_item: Dict[str, Any]) -> Dict[str, Any]:
+        return ", ".join(
+            item.get("MenuItemDescription") or "Unknown Item" for item in menu_items
+        )
+
+    @staticmethod
+    def get_nutrition_info(menu_item: Dict[str, Any]) -> Dict[str, Any]:
         """
         Extract nutrition information from a menu item.
         
@@ -243,7 +429,8 @@ class SchoolCafeAPI:
             "protein": menu_item.get("Protein", 0),
         }
 
-    def get_allergen_info(self, menu_item: Dict[str, Any]) -> List[str]:
+    @staticmethod
+    def get_allergen_info(menu_item: Dict[str, Any]) -> List[str]:
         """
         Extract allergen information from a menu item.
         
@@ -253,7 +440,7 @@ class SchoolCafeAPI:
         Returns:
             List of allergen strings
         """
-        allergens_str = menu_item.get("Allergens", "")
+        allergens_str = (menu_item.get("Allergens") or "").strip()
         if allergens_str:
-            return [allergen.strip() for allergen in allergens_str.split(",")]
+            return _ALLERGEN_SPLIT.split(allergens_str)
         return []
\ No newline at end of file
@@ -2,13 +2,14 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from .api import SchoolCafeAPI, SchoolCafeAPIError
 from .const import (
@@ -43,18 +44,36 @@ STEP_USER_DATA_SCHEMA = vol.Schema(
     }
 )
 
+_DAYS_TO_FETCH_VALIDATOR = vol.All(vol.Coerce(int), vol.Range(min=1, max=30))
+_POLL_INTERVAL_VALIDATOR = vol.All(
+    vol.Coerce(int), vol.Range(min=MIN_POLL_INTERVAL, max=MAX_POLL_INTERVAL)
+)
+
 STEP_ADVANCED_DATA_SCHEMA = vol.Schema(
     {
         vol.Optional(CONF_MENU_LINES, default=", ".join(DEFAULT_MENU_LINES)): str,
-        vol.Optional(CONF_DAYS_TO_FETCH, default=DEFAULT_DAYS_TO_FETCH): vol.All(
-            vol.Coerce(int), vol.Range(min=1, max=30)
-        ),
-        vol.Optional(CONF_POLL_INTERVAL, default=DEFAULT_POLL_INTERVAL): vol.All(
-            vol.Coerce(int), vol.Range(min=MIN_POLL_INTERVAL, max=MAX_POLL_INTERVAL)
-        ),
+        vol.Optional(CONF_DAYS_TO_FETCH, default=DEFAULT_DAYS_TO_FETCH): _DAYS_TO_FETCH_VALIDATOR,
+        vol.Optional(CONF_POLL_INTERVAL, default=DEFAULT_POLL_INTERVAL): _POLL_INTERVAL_VALIDATOR,
     }
 )
 
+# Options form fields as (key, default, validator); only the defaults vary per entry
+_OPTIONS_FIELDS = (
+    (CONF_GRADE, DEFAULT_GRADE, str),
+    (CONF_MEAL_TYPE, DEFAULT_MEAL_TYPE, str),
+    (CONF_SERVING_LINE, DEFAULT_SERVING_LINE, str),
+    (CONF_PERSON_ID, "", str),
+    (CONF_MENU_LINES, ", ".join(DEFAULT_MENU_LINES), str),
+    (CONF_DAYS_TO_FETCH, DEFAULT_DAYS_TO_FETCH, _DAYS_TO_FETCH_VALIDATOR),
+    (CONF_POLL_INTERVAL, DEFAULT_POLL_INTERVAL, _POLL_INTERVAL_VALIDATOR),
+)
+
+
+def parse_menu_lines(menu_lines_str: str) -> List[str]:
+    """Normalize a comma-separated menu line string into upper-case line names."""
+    parts = (part.strip() for part in menu_lines_str.split(","))
+    return [part.upper() for part in parts if part] or list(DEFAULT_MENU_LINES)
+
 
 async def validate_input(hass: HomeAssistant, data: Dict[str, Any]) -> Dict[str, Any]:
     """Validate the user input allows us to connect.
@@ -62,11 +81,7 @@ async def validate_input(hass: HomeAssistant, data: Dict[str, Any]) -> Dict[str,
     Data has the keys from STEP_USER_DATA_SCHEMA with values provided by the user.
     """
     # Process menu lines from comma-separated string to list
-    menu_lines_str = data.get(CONF_MENU_LINES, ", ".join(DEFAULT_MENU_LINES))
-    menu_lines = [line.strip().upper() for line in menu_lines_str.split(",") if line.strip()]
-    
-    if not menu_lines:
-        menu_lines = DEFAULT_MENU_LINES
+    menu_lines = parse_menu_lines(data.get(CONF_MENU_LINES, ", ".join(DEFAULT_MENU_LINES)))
 
     api = SchoolCafeAPI(
         school_id=data[CONF_SCHOOL_ID],
@@ -76,6 +91,7 @@ async def validate_input(hass: HomeAssistant, data: Dict[str, Any]) -> Dict[str,
         person_id=data.get(CONF_PERSON_ID),
         menu_lines=menu_lines,
         days_to_fetch=data.get(CONF_DAYS_TO_FETCH, DEFAULT_DAYS_TO_FETCH),
+        session=async_get_clientsession(hass),
     )
 
     try:
@@ -86,8 +102,6 @@ async def validate_input(hass: HomeAssistant, data: Dict[str, Any]) -> Dict[str,
     except Exception as e:
         _LOGGER.exception("Unexpected error connecting to SchoolCafe API: %s", e)
         raise CannotConnect from e
-    finally:
-        await api.close()
 
     # Return processed data
     processed_data = data.copy()
@@ -195,14 +209,9 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
         if user_input is not None:
             try:
                 # Process menu lines from comma-separated string to list
-                menu_lines_str = user_input.get(CONF_MENU_LINES, ", ".join(DEFAULT_MENU_LINES))
-                menu_lines = [line.strip().upper() for line in menu_lines_str.split(",") if line.strip()]
-                
-                if not menu_lines:
-                    menu_lines = DEFAULT_MENU_LINES
-                
-                # Update the processed menu lines
-                user_input[CONF_MENU_LINES] = menu_lines
+                user_input[CONF_MENU_LINES] = parse_menu_lines(
+                    user_input.get(CONF_MENU_LINES, ", ".join(DEFAULT_MENU_LINES))
+                )
                 
                 return self.async_create_entry(title="", data=user_input)
                 
@@ -211,39 +220,15 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                 errors["base"] = "unknown"
 
         # Get current config values
-        current_config = self.config_entry.data
-        menu_lines_str = ", ".join(current_config.get(CONF_MENU_LINES, DEFAULT_MENU_LINES))
-        
+        current_config = dict(self.config_entry.data)
+        current_config[CONF_MENU_LINES] = ", ".join(
+            current_config.get(CONF_MENU_LINES, DEFAULT_MENU_LINES)
+        )
+
         options_schema = vol.Schema(
             {
-                vol.Optional(
-                    CONF_GRADE,
-                    default=current_config.get(CONF_GRADE, DEFAULT_GRADE)
-                ): str,
-                vol.Optional(
-                    CONF_MEAL_TYPE,
-                    default=current_config.get(CONF_MEAL_TYPE, DEFAULT_MEAL_TYPE)
-                ): str,
-                vol.Optional(
-                    CONF_SERVING_LINE,
-                    default=current_config.get(CONF_SERVING_LINE, DEFAULT_SERVING_LINE)
-                ): str,
-                vol.Optional(
-                    CONF_PERSON_ID,
-                    default=current_config.get(CONF_PERSON_ID, "")
-                ): str,
-                vol.Optional(
-                    CONF_MENU_LINES,
-                    default=menu_lines_str
-                ): str,
-                vol.Optional(
-                    CONF_DAYS_TO_FETCH,
-                    default=current_config.get(CONF_DAYS_TO_FETCH, DEFAULT_DAYS_TO_FETCH)
-                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=30)),
-                vol.Optional(
-                    CONF_POLL_INTERVAL,
-                    default=current_config.get(CONF_POLL_INTERVAL, DEFAULT_POLL_INTERVAL)
-                ): vol.All(vol.Coerce(int), vol.Range(min=MIN_POLL_INTERVAL, max=MAX_POLL_INTERVAL)),
+                vol.Optional(key, default=current_config.get(key, default)): validator
+                for key, default, validator in _OPTIONS_FIELDS
             }
         )
 
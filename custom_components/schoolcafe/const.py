@@ -22,12 +22,25 @@ DEFAULT_DAYS_TO_FETCH = 7
 DEFAULT_POLL_INTERVAL = 60  # Update every 60 minutes (1 hour)
 MIN_POLL_INTERVAL = 15  # Minimum: 15 minutes
 MAX_POLL_INTERVAL = 1440  # Maximum: 1440 minutes (24 hours)
+WEEKEND_POLL_INTERVAL = 720  # minutes (12 hours) between polls on weekends
+
+# Storage constants
+STORAGE_VERSION = 1
+STORAGE_KEY = DOMAIN + "_{entry_id}_cache"  # last successfully fetched menu data
+STORAGE_SAVE_DELAY = 10  # seconds; coalesces writes after each fetch
 
 # API constants
 SCHOOLCAFE_API_BASE = "https://webapis.schoolcafe.com/api"
 DEFAULT_TIMEOUT = 30  # seconds
 MAX_RETRIES = 3
-RETRY_DELAY = 2  # seconds
+RETRY_BASE_DELAY = 1.0  # seconds, doubled on each attempt
+RETRY_MAX_DELAY = 30.0  # seconds
+RETRY_JITTER = 0.5  # +/- fraction applied to each delay
+RETRYABLE_STATUS_CODES = frozenset({408, 429})  # retried along with any 5xx
+ERROR_BODY_MAX_BYTES = 512  # bytes of an error response kept for logging
+CACHE_TTL = 6 * 3600  # seconds a fetched day's menu is reused; well above the default poll interval
+JSON_OFFLOAD_THRESHOLD = 65536  # bytes; larger responses are decoded in a thread
+MAX_CONCURRENT_REQUESTS = 4  # simultaneous day requests sent to the host
 
 # Sensor constants
 ATTR_SERVING_DATE = "serving_date"
@@ -0,0 +1,120 @@
+"""Data update coordinator for the SchoolCafe integration."""
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+
+from .api import SchoolCafeAPI, SchoolCafeAPIError
+from .const import (
+    DOMAIN,
+    STORAGE_KEY,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+    WEEKEND_POLL_INTERVAL,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def get_cache_store(hass: HomeAssistant, entry_id: str) -> Store:
+    """Return the Store holding the last fetched menu data for a config entry."""
+    return Store(hass, STORAGE_VERSION, STORAGE_KEY.format(entry_id=entry_id))
+
+
+class SchoolCafeDataUpdateCoordinator(DataUpdateCoordinator):
+    """Class to manage fetching SchoolCafe data."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api: SchoolCafeAPI,
+        update_interval: timedelta,
+        entry_id: str,
+    ) -> None:
+        """Initialize the coordinator."""
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"{DOMAIN}_{entry_id}",
+            update_interval=update_interval,
+        )
+        self.api = api
+        self._store = get_cache_store(hass, entry_id)
+        # Fetch date (YYYY-MM-DD) and data of the last successful API fetch
+        self._fetched_date: Optional[str] = None
+        # True while data loaded from disk was fetched today and needs no refetch
+        self._cache_is_current = False
+        self._school_day_interval = update_interval
+        self._weekend_interval = max(
+            update_interval, timedelta(minutes=WEEKEND_POLL_INTERVAL)
+        )
+
+    async def async_load_cache(self) -> None:
+        """Seed the coordinator with menu data saved by a previous run."""
+        stored = await self._store.async_load()
+        if not stored:
+            return
+        self.data = stored["data"]
+        self._fetched_date = stored.get("date")
+        self._cache_is_current = self._fetched_date == datetime.now().date().isoformat()
+
+    def _data_to_save(self) -> Dict[str, Any]:
+        """Return the payload written to the Store."""
+        return {"date": self._fetched_date, "data": self.data}
+
+    async def async_save_cache(self) -> None:
+        """Write any pending menu data now instead of after the save delay."""
+        if self.data:
+            # Saving directly also cancels the delayed save queued on this Store
+            await self._store.async_save(self._data_to_save())
+
+    async def async_midnight_refresh(self, _now: datetime) -> None:
+        """Refresh menu data once the day rolls over."""
+        await self.async_request_refresh()
+
+    async def _async_update_data(self) -> Dict[str, Any]:
+        """Fetch data from the SchoolCafe API."""
+        if self._cache_is_current:
+            # Menus saved earlier today are reused as-is after a restart
+            self._cache_is_current = False
+            _LOGGER.debug("Using menu data saved earlier today")
+            return self.data
+
+        try:
+            _LOGGER.debug("Fetching data from SchoolCafe API")
+            data = await self.api.get_menu_data()
+
+            if data is None:
+                _LOGGER.warning("No data received from SchoolCafe API")
+                return self.data or {}
+
+            _LOGGER.debug("Successfully fetched menu data for %d days", len(data))
+
+            # Only freshly fetched data is saved, so stale menus keep their date
+            self._fetched_date = datetime.now().date().isoformat()
+            self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+
+            # Menus don't change on weekends, so poll far less often then
+            if datetime.now().weekday() >= 5:
+                self.update_interval = self._weekend_interval
+            else:
+                self.update_interval = self._school_day_interval
+
+            return data
+
+        except SchoolCafeAPIError as e:
+            if self.data:
+                _LOGGER.warning(
+                    "Error fetching data from SchoolCafe API, keeping previous menu data: %s", e
+                )
+                return self.data
+            _LOGGER.error("Error fetching data from SchoolCafe API: %s", e)
+            raise UpdateFailed(f"Error communicating with SchoolCafe API: {e}") from e
+        except Exception as e:
+            _LOGGER.exception("Unexpected error fetching SchoolCafe data: %s", e)
+            raise UpdateFailed(f"Unexpected error: {e}") from e
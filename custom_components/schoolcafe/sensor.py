@@ -3,23 +3,18 @@ from __future__ import annotations
 
 import logging
 from datetime import datetime, timedelta, date
-from typing import Any, Dict, List, Optional
+from functools import cached_property, lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import (
-    CoordinatorEntity,
-    DataUpdateCoordinator,
-    UpdateFailed,
-)
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .api import SchoolCafeAPI, SchoolCafeAPIError
+from .api import SchoolCafeAPI
 from .const import (
     DOMAIN,
-    CONF_POLL_INTERVAL,
-    DEFAULT_POLL_INTERVAL,
     ATTR_SERVING_DATE,
     ATTR_CATEGORY,
     ATTR_SERVING_LINE,
@@ -33,9 +28,33 @@ from .const import (
     ATTR_NUTRITION,
     ATTR_IS_WEEKDAY,
 )
+from .coordinator import SchoolCafeDataUpdateCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
+# Bit n set for date.weekday() == n on school days: Monday(0) through Friday(4)
+_WEEKDAY_BITS = 0b0011111
+
+# Device fields shared by every SchoolCafe sensor
+DEVICE_INFO_TEMPLATE: Dict[str, str] = {
+    "manufacturer": "SchoolCafe",
+    "model": "Menu Service",
+    "configuration_url": "https://webapis.schoolcafe.com",
+}
+
+
+@lru_cache(maxsize=64)
+def compute_day_labels(day_offset: int, today: date) -> Tuple[str, str, str]:
+    """Return the date key, unique ID suffix and friendly name for a day offset."""
+    target_date = today + timedelta(days=day_offset)
+    date_key = target_date.isoformat()
+    # Suffix is purely numeric for predictability
+    if day_offset == 0:
+        return date_key, "today", "Today"
+    if day_offset == 1:
+        return date_key, "tomorrow", "Tomorrow"
+    return date_key, f"day{day_offset}", f"Today +{day_offset} ({target_date.strftime('%A')})"
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -46,27 +65,19 @@ async def async_setup_entry(
     _LOGGER.warning("SCHOOLCAFE INTEGRATION v1.4.0: NEW DOMAIN schoolcafe_menu - COMPLETE RESET!")
     _LOGGER.debug("Setting up SchoolCafe sensor platform")
 
-    api: SchoolCafeAPI = hass.data[DOMAIN][config_entry.entry_id]
-    poll_interval: int = config_entry.data.get(CONF_POLL_INTERVAL, DEFAULT_POLL_INTERVAL)
-
-    # Create update coordinator
-    coordinator = SchoolCafeDataUpdateCoordinator(
-        hass=hass,
-        api=api,
-        update_interval=timedelta(minutes=poll_interval),
-        entry_id=config_entry.entry_id,
-    )
-
-    # Fetch initial data
-    await coordinator.async_config_entry_first_refresh()
+    coordinator: SchoolCafeDataUpdateCoordinator = hass.data[DOMAIN][config_entry.entry_id]
+    api: SchoolCafeAPI = coordinator.api
 
     # Create sensor entities for each day and menu line combination
     entities = []
     
-    for day_offset in range(api.days_to_fetch):
-        target_date = datetime.now().date() + timedelta(days=day_offset)
-        date_key = target_date.strftime("%Y-%m-%d")
-        
+    today = datetime.now().date()
+    day_suffixes = [
+        (day_offset, compute_day_labels(day_offset, today)[1])
+        for day_offset in range(api.days_to_fetch)
+    ]
+    
+    for day_offset, day_suffix in day_suffixes:
         for menu_line in api.menu_lines:
             entity = SchoolCafeMenuSensor(
                 coordinator=coordinator,
@@ -74,57 +85,35 @@ async def async_setup_entry(
                 api=api,
                 menu_line=menu_line,
                 day_offset=day_offset,
-                date_key=date_key,
+                day_suffix=day_suffix,
+                today=today,
             )
             entities.append(entity)
 
-    async_add_entities(entities, update_before_add=True)
+    # Coordinator data is already loaded, so entities need no update before adding
+    async_add_entities(entities, update_before_add=False)
     _LOGGER.debug("SchoolCafe sensor entities added successfully")
 
 
-class SchoolCafeDataUpdateCoordinator(DataUpdateCoordinator):
-    """Class to manage fetching SchoolCafe data."""
-
-    def __init__(
-        self,
-        hass: HomeAssistant,
-        api: SchoolCafeAPI,
-        update_interval: timedelta,
-        entry_id: str,
-    ) -> None:
-        """Initialize the coordinator."""
-        super().__init__(
-            hass,
-            _LOGGER,
-            name=f"{DOMAIN}_{entry_id}",
-            update_interval=update_interval,
-        )
-        self.api = api
-
-    async def _async_update_data(self) -> Dict[str, Any]:
-        """Fetch data from the SchoolCafe API."""
-        try:
-            _LOGGER.debug("Fetching data from SchoolCafe API")
-            data = await self.api.get_menu_data()
-            
-            if data is None:
-                _LOGGER.warning("No data received from SchoolCafe API")
-                return self.data or {}
-            
-            _LOGGER.debug("Successfully fetched menu data for %d days", len(data))
-            return data
-            
-        except SchoolCafeAPIError as e:
-            _LOGGER.error("Error fetching data from SchoolCafe API: %s", e)
-            raise UpdateFailed(f"Error communicating with SchoolCafe API: {e}") from e
-        except Exception as e:
-            _LOGGER.exception("Unexpected error fetching SchoolCafe data: %s", e)
-            raise UpdateFailed(f"Unexpected error: {e}") from e
-
-
 class SchoolCafeMenuSensor(CoordinatorEntity, SensorEntity):
     """Representation of a SchoolCafe menu sensor."""
 
+    __slots__ = (
+        "_config_entry",
+        "_api",
+        "_menu_line",
+        "_day_offset",
+        "_date_key",
+        "_static_attrs",
+        "_cache_token",
+        "_cache_items",
+        "_cache_desc",
+        "_cache_item_attrs",
+        "_base_date",
+        "_is_weekday",
+        "_empty_attrs",
+    )
+
     _attr_icon = "mdi:food"
 
     def __init__(
@@ -134,7 +123,8 @@ class SchoolCafeMenuSensor(CoordinatorEntity, SensorEntity):
         api: SchoolCafeAPI,
         menu_line: str,
         day_offset: int,
-        date_key: str,
+        day_suffix: str,
+        today: date,
     ) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator)
@@ -143,105 +133,131 @@ class SchoolCafeMenuSensor(CoordinatorEntity, SensorEntity):
         self._api = api
         self._menu_line = menu_line
         self._day_offset = day_offset
-        self._date_key = date_key
+        self._date_key = ""
+        # Attributes that never change for the sensor's lifetime
+        self._static_attrs: Dict[str, Any] = {
+            ATTR_CATEGORY: menu_line,
+            ATTR_SERVING_LINE: api.serving_line,
+            "school_id": api.school_id,
+            "grade": api.grade,
+            "meal_type": api.meal_type,
+        }
+        self._cache_token: Optional[Dict[str, Any]] = None
+        self._cache_items: List[Dict[str, Any]] = []
+        self._cache_desc = "No items available"
+        self._cache_item_attrs: List[Dict[str, Any]] = []
+        self._base_date: Optional[date] = None
+        self._is_weekday = False
+        self._empty_attrs: Dict[str, Any] = {}
+        # Use the same "today" the platform used, so setup can't straddle midnight
+        self._roll_date(today)
         
         # Generate unique ID and name - NO DAY NAMES EVER!
         line_clean = menu_line.replace(" ", "_").lower()
         
-        # Create suffix based on day offset (purely numeric for predictability)
-        if day_offset == 0:
-            day_suffix = "today"
-        elif day_offset == 1:
-            day_suffix = "tomorrow"
-        else:
-            day_suffix = f"day{day_offset}"
-            
         # Entity ID: sensor.schoolcafe_menu_blue_line_today (new domain, clean pattern)
         self._attr_unique_id = f"schoolcafe_menu_{line_clean}_{day_suffix}"
         
-        # Debug logging to verify this code is running
-        _LOGGER.warning("SENSOR CREATION: Creating entity with ID: %s", self._attr_unique_id)
-        
-        # Friendly name based on day offset
-        if day_offset == 0:
-            day_name = "Today"
-        elif day_offset == 1:
-            day_name = "Tomorrow"
-        else:
-            target_date = datetime.now().date() + timedelta(days=day_offset)
-            day_name = f"Today +{day_offset} ({target_date.strftime('%A')})"
-        
-        self._attr_name = f"SchoolCafe {menu_line} {day_name}"
-        
-        _LOGGER.debug("Initialized SchoolCafe menu sensor: %s", self._attr_name)
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(
+                "Initialized SchoolCafe menu sensor: %s (%s)",
+                self._attr_name,
+                self._attr_unique_id,
+            )
+
+    def _roll_date(self, today: Optional[date] = None) -> None:
+        """Move the serving date and name forward when the current day changes."""
+        if today is None:
+            today = datetime.now().date()
+        if today == self._base_date:
+            return
+        self._base_date = today
+        target_date = today + timedelta(days=self._day_offset)
+        self._date_key, _, day_name = compute_day_labels(self._day_offset, today)
+        # The friendly name carries the weekday, so it moves with the date
+        self._attr_name = f"SchoolCafe {self._menu_line} {day_name}"
+        self._is_weekday = bool(_WEEKDAY_BITS & (1 << target_date.weekday()))
+        # Attributes reported when there is no menu for this line and day
+        self._empty_attrs = {
+            **self._static_attrs,
+            ATTR_SERVING_DATE: self._date_key,
+            ATTR_IS_WEEKDAY: self._is_weekday,
+            "item_count": 0,
+        }
+
+    def _build_item_attributes(self, menu_items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Build the detailed per-item attribute list."""
+        get_allergens = self._api.get_allergen_info
+        get_nutrition = self._api.get_nutrition_info
+        return [
+            {
+                "description": item.get("MenuItemDescription", "Unknown Item"),
+                "category": item.get("Category", ""),
+                ATTR_SERVING_SIZE: item.get("ServingSizeByGrade") or item.get("DefaultServingSize", ""),
+                ATTR_CALORIES: item.get("Calories", 0),
+                ATTR_RATING: item.get("MyRating", 0),
+                ATTR_LIKES_PERCENTAGE: item.get("LikesPercentage", 0),
+                ATTR_THUMBNAIL_URL: item.get("ThumbnailImageURL", ""),
+                ATTR_ALLERGENS: get_allergens(item),
+                ATTR_NUTRITION: get_nutrition(item),
+                ATTR_INGREDIENTS: item.get("SubIngredientsDisplay", ""),
+            }
+            for item in menu_items
+        ]
+
+    def _get_menu_items(self) -> Optional[List[Dict[str, Any]]]:
+        """Return this sensor's menu items, or None if the sensor is unavailable.
+
+        Items and their attributes are rebuilt only when the coordinator
+        supplies new data.
+        """
+        self._roll_date()
+        data = self.coordinator.data
+        if not self.coordinator.last_update_success or data is None:
+            return None
+        menu_data = data.get(self._date_key)
+        if menu_data is None:
+            return None
+        if menu_data is not self._cache_token:
+            line_view = self._api.get_day_view(self._date_key, menu_data)[self._menu_line]
+            self._cache_token = menu_data
+            self._cache_items = line_view["items"]
+            self._cache_desc = line_view["description"]
+            self._cache_item_attrs = self._build_item_attributes(self._cache_items)
+        return self._cache_items
 
     @property
     def available(self) -> bool:
         """Return True if entity is available."""
-        return (
-            self.coordinator.last_update_success 
-            and self.coordinator.data is not None
-            and self._date_key in self.coordinator.data
-        )
+        return self._get_menu_items() is not None
 
     @property
     def native_value(self) -> Optional[str]:
         """Return the state of the sensor."""
-        if not self.available:
+        if self._get_menu_items() is None:
             return None
             
-        menu_data = self.coordinator.data.get(self._date_key, {})
-        menu_items = self._api.extract_menu_items_for_line(menu_data, self._menu_line)
-        
-        if not menu_items:
-            return "No items available"
-            
-        return self._api.format_menu_description(menu_items)
+        return self._cache_desc
 
     @property
     def extra_state_attributes(self) -> Dict[str, Any]:
         """Return additional state attributes."""
-        if not self.available:
+        menu_items = self._get_menu_items()
+        if menu_items is None:
             return {}
-            
-        menu_data = self.coordinator.data.get(self._date_key, {})
-        menu_items = self._api.extract_menu_items_for_line(menu_data, self._menu_line)
+        if not menu_items:
+            return self._empty_attrs
         
-        # Calculate if this is a weekday (Monday=0, Sunday=6)
-        target_date = datetime.now().date() + timedelta(days=self._day_offset)
-        is_weekday = target_date.weekday() < 5  # Monday(0) through Friday(4)
+        attributes = self._static_attrs.copy()
+        attributes[ATTR_SERVING_DATE] = self._date_key
+        attributes[ATTR_IS_WEEKDAY] = self._is_weekday
+        attributes["item_count"] = len(menu_items)
         
-        attributes = {
-            ATTR_SERVING_DATE: self._date_key,
-            ATTR_CATEGORY: self._menu_line,
-            ATTR_SERVING_LINE: self._api.serving_line,
-            ATTR_IS_WEEKDAY: is_weekday,
-            "school_id": self._api.school_id,
-            "grade": self._api.grade,
-            "meal_type": self._api.meal_type,
-            "item_count": len(menu_items),
-            "items": [],
-        }
-        
-        # Add detailed information for each menu item
-        for item in menu_items:
-            item_info = {
-                "description": item.get("MenuItemDescription", "Unknown Item"),
-                "category": item.get("Category", ""),
-                ATTR_SERVING_SIZE: item.get("ServingSizeByGrade", item.get("DefaultServingSize", "")),
-                ATTR_CALORIES: item.get("Calories", 0),
-                ATTR_RATING: item.get("MyRating", 0),
-                ATTR_LIKES_PERCENTAGE: item.get("LikesPercentage", 0),
-                ATTR_THUMBNAIL_URL: item.get("ThumbnailImageURL", ""),
-                ATTR_ALLERGENS: self._api.get_allergen_info(item),
-                ATTR_NUTRITION: self._api.get_nutrition_info(item),
-                ATTR_INGREDIENTS: item.get("SubIngredientsDisplay", ""),
-            }
-            attributes["items"].append(item_info)
+        attributes["items"] = self._cache_item_attrs
         
         return attributes
 
-    @property
+    @cached_property
     def device_info(self) -> Dict[str, Any]:
         """Return device information."""
         school_id_short = self._api.school_id[:8]
@@ -249,9 +265,7 @@ class SchoolCafeMenuSensor(CoordinatorEntity, SensorEntity):
         return {
             "identifiers": {(DOMAIN, f"schoolcafe_{self._api.school_id}")},
             "name": f"SchoolCafe Menu ({school_id_short}...)",
-            "manufacturer": "SchoolCafe",
-            "model": "Menu Service",
-            "configuration_url": "https://webapis.schoolcafe.com",
+            **DEVICE_INFO_TEMPLATE,
         }
 
     async def async_added_to_hass(self) -> None: